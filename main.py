@@ -1,6 +1,197 @@
+import os
+from datetime import date
+from functools import lru_cache
+
 import pandas as pd
 import numpy as np
 import yfinance as yf
+from numba import njit, prange
+
+CACHE_DIR = '.cache'
+
+
+@njit(
+    [
+        'UniTuple(float64[:], 2)(float32[:], float64[:], int64, float64)',
+        'UniTuple(float64[:], 2)(float64[:], float64[:], int64, float64)',
+    ],
+    parallel=True,
+    fastmath=True,
+    cache=True,
+)
+def _simulate(prices, inverse_cumsum, window, amount):
+    """
+    Simulate both strategies over every `window`-long period of `prices`.
+
+    Every start month from the first to `prices.size - window` is simulated. The
+    shares bought by DCA over a period are read off `inverse_cumsum` in constant
+    time, so the cost does not depend on `window`. Start months are spread
+    across all cores.
+
+    Parameters
+    ----------
+    prices : np.array
+        The historical prices of the asset.
+    inverse_cumsum : np.array
+        Cumulative sum of `1 / prices`, with a leading zero.
+    window : int
+        Length of each investment period in months.
+    amount : float
+        The amount to be invested.
+
+    Returns
+    -------
+    tuple
+        The lump sum and DCA ending values for each period.
+    """
+    n_windows = max(0, prices.size - window + 1)
+    lumpsum_ending_values = np.empty(n_windows)
+    dca_ending_values = np.empty(n_windows)
+
+    for start in prange(n_windows):
+        inverse_sum = inverse_cumsum[start + window] - inverse_cumsum[start]
+        final_price = prices[start + window - 1]
+        lumpsum_ending_values[start] = amount * final_price / prices[start]
+        dca_ending_values[start] = (amount / window) * inverse_sum * final_price
+
+    return lumpsum_ending_values, dca_ending_values
+
+
+@njit('float64(float64, float64, int64)', cache=True)
+def _annualize(ending_value, amount, window):
+    """
+    Annualized return of growing `amount` to `ending_value` over `window` months.
+    """
+    return np.expm1(np.log(ending_value / amount) * (12.0 / window))
+
+
+@njit('Tuple((int64, float64, float64))(float64[:], float64[:], float64, int64, boolean)', cache=True)
+def _reduce(lumpsum_ending_values, dca_ending_values, amount, window, geometric_mean):
+    """
+    Count lump sum wins and average the annualized returns in a single pass.
+
+    The geometric mean only needs one log per period and a single expm1 at the
+    end, where the arithmetic mean annualizes every period separately.
+
+    Parameters
+    ----------
+    lumpsum_ending_values : np.array
+        The lump sum ending value for each period.
+    dca_ending_values : np.array
+        The DCA ending value for each period.
+    amount : float
+        The amount invested.
+    window : int
+        Length of each investment period in months.
+    geometric_mean : bool
+        Average the periods' growth geometrically instead of averaging their annualized returns.
+
+    Returns
+    -------
+    tuple
+        The number of lump sum wins, and the average lump sum and DCA annualized returns.
+        The averages are NaN when there are no periods.
+    """
+    n_windows = lumpsum_ending_values.size
+    if n_windows == 0:
+        return 0, np.nan, np.nan
+
+    lumpsum_wins = 0
+    lumpsum_sum = 0.0
+    dca_sum = 0.0
+
+    for i in range(lumpsum_ending_values.size):
+        lumpsum_ending_value = lumpsum_ending_values[i]
+        dca_ending_value = dca_ending_values[i]
+        if geometric_mean:
+            lumpsum_sum += np.log(lumpsum_ending_value)
+            dca_sum += np.log(dca_ending_value)
+        else:
+            lumpsum_sum += _annualize(lumpsum_ending_value, amount, window)
+            dca_sum += _annualize(dca_ending_value, amount, window)
+        if lumpsum_ending_value > dca_ending_value:
+            lumpsum_wins += 1
+
+    if geometric_mean:
+        # The log of the amount is taken out of the loop: mean(log(v / a)) = mean(log(v)) - log(a)
+        log_amount = np.log(amount)
+        exponent = 12.0 / window
+        lumpsum_return = np.expm1((lumpsum_sum / n_windows - log_amount) * exponent)
+        dca_return = np.expm1((dca_sum / n_windows - log_amount) * exponent)
+        return lumpsum_wins, lumpsum_return, dca_return
+    return lumpsum_wins, lumpsum_sum / n_windows, dca_sum / n_windows
+
+
+def _simulate_year(prices, inverse_cumsum, amount, geometric_mean, year):
+    """
+    Simulate both strategies for one period length.
+
+    Parameters
+    ----------
+    prices : np.array
+        Preprocessed adjusted close prices.
+    inverse_cumsum : np.array
+        Cumulative sum of `1 / prices`, with a leading zero.
+    amount : float
+        The amount to be invested.
+    geometric_mean : bool
+        Average the annualized returns geometrically rather than arithmetically.
+    year : int
+        Number of years for simulation.
+
+    Returns
+    -------
+    tuple
+        The number of wins for lump sum and DCA strategies, and their average annualized returns.
+    """
+    window = year * 12
+    # Periods never end on the final month of the series
+    lumpsum_ending_values, dca_ending_values = _simulate(prices[:-1], inverse_cumsum[:-1], window, amount)
+    lumpsum_wins, lumpsum_return, dca_return = _reduce(
+        lumpsum_ending_values, dca_ending_values, amount, window, geometric_mean
+    )
+    dca_wins = lumpsum_ending_values.size - lumpsum_wins
+    return lumpsum_wins, dca_wins, lumpsum_return, dca_return
+
+
+@lru_cache(maxsize=32)
+def _load_prices(symbol, interval, day):
+    """
+    Load the preprocessed adjusted close prices of `symbol` as of `day`.
+
+    Results are cached on disk and in memory under the day, so a long-running
+    process fetches fresh prices once the date changes.
+
+    Parameters
+    ----------
+    symbol : str
+        The stock symbol to download data for.
+    interval : str
+        The interval between price points.
+    day : datetime.date
+        The date the prices are loaded for.
+
+    Returns
+    -------
+    pd.Series
+        Preprocessed adjusted close prices.
+    """
+    path = os.path.join(CACHE_DIR, f"{symbol}_{interval}_{day.isoformat()}.pkl")
+    if os.path.exists(path):
+        return pd.read_pickle(path)
+
+    # A single symbol gains nothing from yfinance's thread pool, and with
+    # auto_adjust the 'Close' column already holds adjusted prices. Flat
+    # columns make data['Close'] a Series rather than a one-column frame.
+    data = yf.download(
+        symbol, period="max", interval=interval, progress=False, threads=False, auto_adjust=True,
+        multi_level_index=False
+    )
+    prices = data['Close'].dropna()  # drop months with missing prices
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    prices.to_pickle(path)
+    return prices
 
 
 class InvestmentStrategies:
@@ -13,11 +204,14 @@ class InvestmentStrategies:
         The amount to be invested.
     years : list of int
         The list of years for which the strategies should be tested.
+    geometric_mean : bool
+        Whether to report the geometric rather than the arithmetic mean of the annualized returns.
     """
 
-    def __init__(self, amount, years):
+    def __init__(self, amount, years, geometric_mean=True):
         self.amount = amount
         self.years = years
+        self.geometric_mean = geometric_mean
 
     def invest_dca(self, amount, prices):
         """
@@ -35,15 +229,12 @@ class InvestmentStrategies:
         tuple
             The ending value of the investment and the annualized return.
         """
-        shares_bought_each_period = amount / prices
-        total_shares_bought = np.sum(shares_bought_each_period)
-        avg_cost_per_share = amount * len(prices) / total_shares_bought
-        final_value_per_share = prices[-1]
-        ending_value = total_shares_bought * final_value_per_share
-        total_return = (final_value_per_share - avg_cost_per_share) / avg_cost_per_share
-        years = len(prices) / 12
-        annualized_return = (1 + total_return) ** (1 / years) - 1
-        return ending_value, annualized_return
+        prices = np.array(prices, dtype=np.float64)
+        window = len(prices)
+        inverse_cumsum = np.concatenate(([0.0], np.cumsum(1.0 / prices)))
+        _, dca_ending_values = _simulate(prices, inverse_cumsum, window, amount * window)
+        ending_value = dca_ending_values[0]
+        return ending_value, _annualize(ending_value, amount * window, window)
 
     def invest_lumpsum(self, amount, prices):
         """
@@ -61,9 +252,12 @@ class InvestmentStrategies:
         tuple
             The ending value of the investment and the annualized return.
         """
-        shares_bought = amount / prices[0]
-        ending_value = shares_bought * prices[-1]
-        return ending_value, (ending_value / amount) ** (1 / (len(prices) / 12)) - 1
+        prices = np.array(prices, dtype=np.float64)
+        window = len(prices)
+        inverse_cumsum = np.concatenate(([0.0], np.cumsum(1.0 / prices)))
+        lumpsum_ending_values, _ = _simulate(prices, inverse_cumsum, window, amount)
+        ending_value = lumpsum_ending_values[0]
+        return ending_value, _annualize(ending_value, amount, window)
 
     def test_strategies(self):
         """
@@ -81,99 +275,88 @@ class InvestmentStrategies:
         pd.DataFrame
             A DataFrame with the results of the comparison.
         """
-        results = []
-
         # Download all the available data at once
         data = self.download_data('^IXIC')
 
-        for year in self.years:
-            lumpsum_wins, dca_wins, lumpsum_returns, dca_returns = self.simulate_strategies(data, year)
-            
-            results.append({
-                'Year': year,
-                'Lump Sum Wins': lumpsum_wins,
-                'Dollar-Cost Averaging Wins': dca_wins,
-                'Average Annualized Lump Sum Return': np.mean(lumpsum_returns) * 100,
-                'Average Annualized DCA Return': np.mean(dca_returns) * 100,
-                'Lump Sum Win Ratio': self.calculate_win_ratio(lumpsum_wins, dca_wins)
-            })
-
-        return pd.DataFrame(results)
-
-
-    def download_data(self, symbol):
+        # Shared by every year: each period length only slices these arrays.
+        # Prices fit in float32, but the prefix sum is accumulated in float64 so
+        # that differences between its entries keep their precision.
+        prices = data.to_numpy(dtype=np.float32)
+        inverse_cumsum = np.concatenate(([0.0], np.cumsum(1.0 / prices, dtype=np.float64)))
+
+        simulations = [self.simulate_strategies(prices, inverse_cumsum, year) for year in self.years]
+
+        # One array per column, so the DataFrame is built without boxing each value
+        n_years = len(self.years)
+        years = np.empty(n_years, dtype=np.int64)
+        lumpsum_wins = np.empty(n_years, dtype=np.int64)
+        dca_wins = np.empty(n_years, dtype=np.int64)
+        lumpsum_returns = np.empty(n_years)
+        dca_returns = np.empty(n_years)
+
+        for i, (year, simulation) in enumerate(zip(self.years, simulations)):
+            years[i] = year
+            lumpsum_wins[i], dca_wins[i], lumpsum_returns[i], dca_returns[i] = simulation
+
+        # Periods longer than the history have no windows, and so no win ratio
+        n_windows = lumpsum_wins + dca_wins
+        win_ratios = np.divide(lumpsum_wins * 100.0, n_windows, out=np.full(n_years, np.nan), where=n_windows > 0)
+
+        # Name the statistic so the geometric mean is not mistaken for the arithmetic average
+        mean_label = 'Geometric Mean' if self.geometric_mean else 'Average'
+
+        return pd.DataFrame({
+            'Year': years,
+            'Lump Sum Wins': lumpsum_wins,
+            'Dollar-Cost Averaging Wins': dca_wins,
+            f'{mean_label} Annualized Lump Sum Return': lumpsum_returns * 100,
+            f'{mean_label} Annualized DCA Return': dca_returns * 100,
+            'Lump Sum Win Ratio': win_ratios
+        })
+
+
+    @staticmethod
+    def download_data(symbol, interval='1mo'):
         """
         Download and preprocess historical data.
 
+        Downloads are cached on disk for the day, so repeated runs do not hit the network,
+        and in memory, so instances in the same process share a single load.
+
         Parameters
         ----------
         symbol : str
             The stock symbol to download data for.
+        interval : str
+            The interval between price points.
 
         Returns
         -------
         pd.Series
-            Preprocessed adjusted close prices.
+            Preprocessed adjusted close prices. Each call returns its own copy.
         """
-        data = yf.download(symbol, period="max", interval='1mo')
-        data.dropna(inplace=True)  # drop rows with missing data
-        return data['Adj Close']
+        return _load_prices(symbol, interval, date.today()).copy()
 
 
-    def simulate_strategies(self, data, year):
+    def simulate_strategies(self, prices, inverse_cumsum, year):
         """
         Simulate lump sum and DCA strategies and calculate wins and returns.
 
         Parameters
         ----------
-        data : pd.Series
+        prices : np.array
             Preprocessed adjusted close prices.
+        inverse_cumsum : np.array
+            Cumulative sum of `1 / prices`, with a leading zero.
         year : int
             Number of years for simulation.
 
         Returns
         -------
         Tuple
-            A tuple containing the number of wins for lump sum and DCA strategies, and the corresponding returns.
-        """
-        lumpsum_wins = 0
-        dca_wins = 0
-        lumpsum_returns = []
-        dca_returns = []
-
-        for start in range(len(data) - year * 12):
-            prices = data.iloc[start:start + year * 12]
-            lumpsum_ending_value, lumpsum_return = self.invest_lumpsum(self.amount, prices)
-            dca_ending_value, dca_return = self.invest_dca(self.amount / (year * 12), prices)
-            lumpsum_returns.append(lumpsum_return)
-            dca_returns.append(dca_return)
-
-            if lumpsum_ending_value > dca_ending_value:
-                lumpsum_wins += 1
-            else:
-                dca_wins += 1
-
-        return lumpsum_wins, dca_wins, lumpsum_returns, dca_returns
-
-
-    def calculate_win_ratio(self, lumpsum_wins, dca_wins):
-        """
-        Calculate the win ratio between lump sum and DCA strategies.
-
-        Parameters
-        ----------
-        lumpsum_wins : int
-            Number of wins for the lump sum strategy.
-        dca_wins : int
-            Number of wins for the DCA strategy.
-
-        Returns
-        -------
-        float
-            The win ratio in percentage.
+            A tuple containing the number of wins for lump sum and DCA strategies, and their average annualized returns.
         """
-        total_wins = lumpsum_wins + dca_wins
-        return total_wins
+        return _simulate_year(prices, inverse_cumsum, float(self.amount), self.geometric_mean, year)
 
 
 